@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-15 17:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_breathingexercise_dailyquote_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moodentry',
+            index=models.Index(fields=['user', '-date'], name='core_mooden_user_id_6200e2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', '-is_pinned', '-updated_at'], name='core_note_user_id_827535_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pomodorosession',
+            index=models.Index(fields=['user', '-start_time'], name='core_pomodo_user_id_d0c38c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pomodorosession',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['user'], name='pomo_active'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'status'], name='core_task_user_id_0440f1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', '-due_date'], name='core_task_user_id_56bb3f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'category'], name='core_task_user_id_235b8b_idx'),
+        ),
+    ]
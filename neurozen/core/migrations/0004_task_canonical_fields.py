@@ -0,0 +1,77 @@
+# Generated by Django 5.2 on 2026-10-15 17:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, F, Value, When
+
+STATUS_CODES = {
+    'pending': 'P',
+    'in_progress': 'IP',
+    'completed': 'C',
+    'cancelled': 'X',
+}
+
+PRIORITY_CODES = {
+    'low': 'L',
+    'medium': 'M',
+    'high': 'H',
+}
+
+
+def _remap(apps, status_codes, priority_codes):
+    # One UPDATE for both columns: a second UPDATE of the same rows queues the
+    # deferred FK triggers, and the AlterFields that follow then fail with
+    # "pending trigger events".
+    Task = apps.get_model('core', 'Task')
+    Task.objects.update(
+        status=Case(*(When(status=old, then=Value(new)) for old, new in status_codes.items()), default=F('status')),
+        priority=Case(*(When(priority=old, then=Value(new)) for old, new in priority_codes.items()), default=F('priority')),
+    )
+
+
+def forwards(apps, schema_editor):
+    _remap(apps, STATUS_CODES, PRIORITY_CODES)
+
+
+def backwards(apps, schema_editor):
+    _remap(
+        apps,
+        {new: old for old, new in STATUS_CODES.items()},
+        {new: old for old, new in PRIORITY_CODES.items()},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='estimated_time',
+            field=models.IntegerField(blank=True, help_text='Estimated time in minutes', null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='is_break_task',
+            field=models.BooleanField(default=False, help_text='Is this a break task?'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='parent_task',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to='core.task'),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=models.CharField(choices=[('L', 'Low'), ('M', 'Medium'), ('H', 'High')], default='M', max_length=1),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('P', 'Pending'), ('IP', 'In Progress'), ('C', 'Completed'), ('X', 'Cancelled')], default='P', max_length=2),
+        ),
+    ]
@@ -0,0 +1,81 @@
+from django.db import migrations, models
+
+PALETTE = {
+    0: '#FFF5E6',
+    1: '#F5F5F5',
+    2: '#FFE4E1',
+    3: '#FFDAB9',
+    4: '#E0E0E0',
+    5: '#F44336',
+}
+
+CATEGORY_COLOR_CHOICES = [
+    (0, 'Warm White - Joy'),
+    (1, 'Off White - Work'),
+    (2, 'Misty Rose - Health'),
+    (3, 'Peach - Learning'),
+    (5, 'Red - Urgent'),
+    (4, 'Gray - Other'),
+]
+
+TAG_COLOR_CHOICES = [
+    (0, 'Warm White'),
+    (1, 'Off White'),
+    (2, 'Misty Rose'),
+    (3, 'Peach'),
+    (4, 'Gray'),
+    (5, 'Red'),
+]
+
+
+def forwards(apps, schema_editor):
+    for model_name in ('Category', 'Tag'):
+        Model = apps.get_model('core', model_name)
+        for index, hex_code in PALETTE.items():
+            Model.objects.filter(color__iexact=hex_code).update(color_index=index)
+
+
+def backwards(apps, schema_editor):
+    for model_name in ('Category', 'Tag'):
+        Model = apps.get_model('core', model_name)
+        for index, hex_code in PALETTE.items():
+            Model.objects.filter(color_index=index).update(color=hex_code)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_task_canonical_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='color_index',
+            field=models.PositiveSmallIntegerField(choices=CATEGORY_COLOR_CHOICES, default=0),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='color_index',
+            field=models.PositiveSmallIntegerField(choices=TAG_COLOR_CHOICES, default=0),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name='category',
+            name='color',
+        ),
+        migrations.RemoveField(
+            model_name='tag',
+            name='color',
+        ),
+        migrations.RenameField(
+            model_name='category',
+            old_name='color_index',
+            new_name='color',
+        ),
+        migrations.RenameField(
+            model_name='tag',
+            old_name='color_index',
+            new_name='color',
+        ),
+    ]
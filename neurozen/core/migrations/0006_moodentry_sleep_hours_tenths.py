@@ -0,0 +1,25 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_palette_color_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moodentry',
+            name='sleep_hours_tenths',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Tenths of an hour of sleep last night (75 = 7.5h)', null=True, validators=[django.core.validators.MaxValueValidator(240)]),
+        ),
+        migrations.RunSQL(
+            sql='UPDATE core_moodentry SET sleep_hours_tenths = ROUND(sleep_hours * 10) WHERE sleep_hours IS NOT NULL',
+            reverse_sql='UPDATE core_moodentry SET sleep_hours = sleep_hours_tenths / 10.0 WHERE sleep_hours_tenths IS NOT NULL',
+        ),
+        migrations.RemoveField(
+            model_name='moodentry',
+            name='sleep_hours',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-15 17:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_moodentry_sleep_hours_tenths'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='category',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='moodentry',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='tag',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_category_user_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='moodentry',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='uniq_moodentry_user_date'),
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_tag_user_name'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2 on 2026-10-15 17:23
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+SET_UPDATED_AT = """
+CREATE OR REPLACE FUNCTION core_set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+UPDATED_AT_TABLES = ['core_task', 'core_note']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='note',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='note',
+            name='updated_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='pomodorosession',
+            name='start_time',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='reward',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='tag',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.RunSQL(
+            sql=SET_UPDATED_AT,
+            reverse_sql='DROP FUNCTION IF EXISTS core_set_updated_at()',
+        ),
+    ] + [
+        migrations.RunSQL(
+            sql=(
+                f'CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} '
+                'FOR EACH ROW EXECUTE FUNCTION core_set_updated_at()'
+            ),
+            reverse_sql=f'DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}',
+        )
+        for table in UPDATED_AT_TABLES
+    ]
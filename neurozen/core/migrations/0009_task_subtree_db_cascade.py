@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-15 17:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Every foreign key that can point at a subtask has to act in the database,
+# otherwise rows referencing a cascaded subtask would fail the deferred
+# constraint check at commit.
+DB_ACTIONS = [
+    ('core_task', 'parent_task_id', 'ON DELETE CASCADE'),
+    ('core_task_tags', 'task_id', 'ON DELETE CASCADE'),
+    ('core_pomodorosession', 'task_id', 'ON DELETE SET NULL'),
+]
+
+
+def _set_actions(schema_editor, with_actions):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    introspection = schema_editor.connection.introspection
+    with schema_editor.connection.cursor() as cursor:
+        for table, column, action in DB_ACTIONS:
+            constraints = introspection.get_constraints(cursor, table)
+            for name, info in constraints.items():
+                if info['foreign_key'] and info['columns'] == [column]:
+                    schema_editor.execute(
+                        f'ALTER TABLE {table} DROP CONSTRAINT {name}, '
+                        f'ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES core_task (id) '
+                        f'{action if with_actions else ""} DEFERRABLE INITIALLY DEFERRED'
+                    )
+
+
+def forwards(apps, schema_editor):
+    _set_actions(schema_editor, with_actions=True)
+
+
+def backwards(apps, schema_editor):
+    _set_actions(schema_editor, with_actions=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_db_side_timestamps'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='parent_task',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='subtasks', to='core.task'),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
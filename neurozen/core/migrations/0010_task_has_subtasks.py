@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-15 17:24
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('core', 'Task')
+    Task.objects.filter(Exists(Task.objects.filter(parent_task=OuterRef('pk')))).update(has_subtasks=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_task_subtree_db_cascade'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='has_subtasks',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
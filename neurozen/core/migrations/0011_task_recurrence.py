@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-15 17:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_task_has_subtasks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='recurrence',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'None'), (1, 'Daily'), (2, 'Weekly'), (3, 'Monthly'), (99, 'Custom')], db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='recurrence_interval_days',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Days between repeats for custom recurrence', null=True),
+        ),
+    ]
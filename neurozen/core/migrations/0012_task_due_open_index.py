@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-15 17:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_task_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ['P', 'IP'])), fields=['due_date'], name='task_due_open'),
+        ),
+    ]
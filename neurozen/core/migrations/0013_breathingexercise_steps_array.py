@@ -0,0 +1,61 @@
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+MAX_STEPS = 32
+MAX_STEP_LENGTH = 200
+
+
+def split_steps(apps, schema_editor):
+    BreathingExercise = apps.get_model('core', 'BreathingExercise')
+    invalid = []
+    for exercise in BreathingExercise.objects.only('steps'):
+        exercise.steps_list = [line.strip() for line in exercise.steps.splitlines() if line.strip()]
+        if len(exercise.steps_list) > MAX_STEPS or any(len(step) > MAX_STEP_LENGTH for step in exercise.steps_list):
+            invalid.append(exercise.pk)
+            continue
+        exercise.save(update_fields=['steps_list'])
+    # PostgreSQL doesn't enforce the array size, and truncating would silently
+    # lose text, so stop here and let the data be fixed first.
+    if invalid:
+        raise RuntimeError(
+            f"BreathingExercise rows {invalid} have more than {MAX_STEPS} steps or a step longer "
+            f"than {MAX_STEP_LENGTH} characters; fix their steps before running this migration."
+        )
+
+
+def join_steps(apps, schema_editor):
+    BreathingExercise = apps.get_model('core', 'BreathingExercise')
+    for exercise in BreathingExercise.objects.only('steps_list'):
+        exercise.steps = '\n'.join(exercise.steps_list)
+        exercise.save(update_fields=['steps'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_task_due_open_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='breathingexercise',
+            name='steps_list',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=200), default=list, help_text='Step by step instructions', size=32),
+        ),
+        migrations.RunPython(split_steps, join_steps),
+        # Gives the re-added text column a default when migrating backwards.
+        migrations.AlterField(
+            model_name='breathingexercise',
+            name='steps',
+            field=models.TextField(default='', help_text='Step by step instructions'),
+        ),
+        migrations.RemoveField(
+            model_name='breathingexercise',
+            name='steps',
+        ),
+        migrations.RenameField(
+            model_name='breathingexercise',
+            old_name='steps_list',
+            new_name='steps',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-15 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_breathingexercise_steps_array'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyquote',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['date'], include=('quote', 'author'), name='daily_quote_today'),
+        ),
+    ]
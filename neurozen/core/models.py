@@ -1,163 +1,357 @@
-from django.db import models
+import time
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import connections, models
+from django.db.models import Avg, Count, FloatField, Q
+from django.db.models.functions import Cast, Now
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
-class Category(models.Model):
-    COLOR_CHOICES = [
-        ('#FFF5E6', 'Warm White - Joy'),
-        ('#F5F5F5', 'Off White - Work'),
-        ('#FFE4E1', 'Misty Rose - Health'),
-        ('#FFDAB9', 'Peach - Learning'),
-        ('#F44336', 'Red - Urgent'),
-        ('#E0E0E0', 'Gray - Other'),
-    ]
+PALETTE = {
+    0: '#FFF5E6',
+    1: '#F5F5F5',
+    2: '#FFE4E1',
+    3: '#FFDAB9',
+    4: '#E0E0E0',
+    5: '#F44336',
+}
+
+class OwnedByRequestUserMixin:
+    @classmethod
+    def for_user(cls, user):
+        qs = cls.objects.filter(user=user)
+        related = qs.query.select_related
+        if isinstance(related, dict) and 'user' in related:
+            # select_related() with no arguments follows every FK, user included.
+            others = [name for name in related if name != 'user']
+            qs = qs.select_related(None)
+            if others:
+                qs = qs.select_related(*others)
+        for obj in qs:
+            obj.user = user
+            yield obj
+
+_CATEGORY_COLOR_CHOICES = (
+    (0, 'Warm White - Joy'),
+    (1, 'Off White - Work'),
+    (2, 'Misty Rose - Health'),
+    (3, 'Peach - Learning'),
+    (5, 'Red - Urgent'),
+    (4, 'Gray - Other'),
+)
+
+_TAG_COLOR_CHOICES = (
+    (0, 'Warm White'),
+    (1, 'Off White'),
+    (2, 'Misty Rose'),
+    (3, 'Peach'),
+    (4, 'Gray'),
+    (5, 'Red'),
+)
+
+class Category(OwnedByRequestUserMixin, models.Model):
+    COLOR_CHOICES = _CATEGORY_COLOR_CHOICES
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
-    color = models.CharField(max_length=7, choices=COLOR_CHOICES, default='#FFF5E6')
+    color = models.PositiveSmallIntegerField(choices=COLOR_CHOICES, default=0)
     description = models.TextField(blank=True)
     icon = models.CharField(max_length=50, blank=True, help_text="Font Awesome icon class")
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
 
     class Meta:
         verbose_name_plural = "Categories"
-        unique_together = ['user', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'name'], name='uniq_category_user_name'),
+        ]
 
     def __str__(self):
         return self.name
 
-class Tag(models.Model):
-    TAG_COLOR_CHOICES = [
-        ('#FFF5E6', 'Warm White'),
-        ('#F5F5F5', 'Off White'),
-        ('#FFE4E1', 'Misty Rose'),
-        ('#FFDAB9', 'Peach'),
-        ('#E0E0E0', 'Gray'),
-        ('#F44336', 'Red'),
-    ]
+    @property
+    def color_hex(self):
+        return PALETTE[self.color]
+
+class Tag(OwnedByRequestUserMixin, models.Model):
+    TAG_COLOR_CHOICES = _TAG_COLOR_CHOICES
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=50)
-    color = models.CharField(max_length=7, choices=TAG_COLOR_CHOICES, default='#FFF5E6')
-    created_at = models.DateTimeField(auto_now_add=True)
+    color = models.PositiveSmallIntegerField(choices=TAG_COLOR_CHOICES, default=0)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
 
     class Meta:
-        unique_together = ['user', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'name'], name='uniq_tag_user_name'),
+        ]
 
     def __str__(self):
         return self.name
 
-class Task(models.Model):
-    STATUS_CHOICES = [
-        ('pending', 'Pending'),
-        ('in_progress', 'In Progress'),
-        ('completed', 'Completed'),
-        ('cancelled', 'Cancelled'),
-    ]
-    
-    PRIORITY_CHOICES = [
-        ('low', 'Low'),
-        ('medium', 'Medium'),
-        ('high', 'High'),
-    ]
-    
+    @property
+    def color_hex(self):
+        return PALETTE[self.color]
+
+class BulkManager(models.Manager):
+    def bulk_create_batched(self, objs, **kwargs):
+        batch_size = kwargs.pop('batch_size', self.model.BULK_BATCH_SIZE)
+        return self.bulk_create(objs, batch_size=batch_size, **kwargs)
+
+class TaskManager(BulkManager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('user', 'category')
+
+    def summary(self):
+        return self.get_queryset().select_related(None).only(
+            'id', 'title', 'status', 'priority', 'due_date', 'user_id', 'category_id', 'updated_at'
+        )
+
+    def bulk_create_batched(self, objs, **kwargs):
+        # bulk_create() sends no signals, so flag the parents here. Plain
+        # bulk_create() and queryset.update(parent_task=...) skip this.
+        objs = super().bulk_create_batched(objs, **kwargs)
+        parent_ids = {obj.parent_task_id for obj in objs if obj.parent_task_id}
+        if parent_ids:
+            self.model.raw.filter(pk__in=parent_ids, has_subtasks=False).update(has_subtasks=True)
+        return objs
+
+    def claim_next(self, user):
+        Status, Priority = self.model.Status, self.model.Priority
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table} SET status = %s
+                WHERE id = (
+                    SELECT id FROM {table}
+                    WHERE user_id = %s AND status = %s
+                    ORDER BY CASE priority WHEN %s THEN 0 WHEN %s THEN 1 ELSE 2 END, due_date NULLS LAST
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, title
+                """,
+                [
+                    Status.IN_PROGRESS.value, user.id, Status.PENDING.value,
+                    Priority.HIGH.value, Priority.MEDIUM.value,
+                ],
+            )
+            return cursor.fetchone()
+
+class Task(OwnedByRequestUserMixin, models.Model):
+    BULK_BATCH_SIZE = 500
+
+    class Status(models.TextChoices):
+        PENDING = 'P', 'Pending'
+        IN_PROGRESS = 'IP', 'In Progress'
+        COMPLETED = 'C', 'Completed'
+        CANCELLED = 'X', 'Cancelled'
+
+    class Priority(models.TextChoices):
+        LOW = 'L', 'Low'
+        MEDIUM = 'M', 'Medium'
+        HIGH = 'H', 'High'
+
+    class Recurrence(models.IntegerChoices):
+        NONE = 0, 'None'
+        DAILY = 1, 'Daily'
+        WEEKLY = 2, 'Weekly'
+        MONTHLY = 3, 'Monthly'
+        CUSTOM = 99, 'Custom'
+
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     due_date = models.DateTimeField(null=True, blank=True)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
-    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    status = models.CharField(max_length=2, choices=Status.choices, default=Status.PENDING)
+    priority = models.CharField(max_length=1, choices=Priority.choices, default=Priority.MEDIUM)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+    updated_at = models.DateTimeField(db_default=Now(), editable=False)
+    estimated_time = models.IntegerField(null=True, blank=True, help_text="Estimated time in minutes")
+    is_break_task = models.BooleanField(default=False, help_text="Is this a break task?")
+    recurrence = models.PositiveSmallIntegerField(choices=Recurrence.choices, default=Recurrence.NONE, db_index=True)
+    recurrence_interval_days = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Days between repeats for custom recurrence")
     user = models.ForeignKey('auth.User', on_delete=models.CASCADE)
     category = models.ForeignKey('Category', on_delete=models.SET_NULL, null=True, blank=True)
+    # Subtasks are removed by the database's ON DELETE CASCADE (see migration
+    # 0009), so the collector doesn't walk the subtree one level at a time.
+    parent_task = models.ForeignKey('self', on_delete=models.DO_NOTHING, null=True, blank=True, related_name='subtasks')
     tags = models.ManyToManyField('Tag', blank=True)
-    
+    has_subtasks = models.BooleanField(default=False, editable=False)
+
+    objects = TaskManager()
+    raw = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'status']),
+            models.Index(fields=['user', '-due_date']),
+            models.Index(fields=['user', 'category']),
+            models.Index(
+                fields=['due_date'],
+                name='task_due_open',
+                condition=models.Q(status__in=['P', 'IP']),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'parent_task_id' in instance.__dict__:
+            instance._loaded_parent_task_id = instance.parent_task_id
+        return instance
+
     def __str__(self):
         return self.title
 
-class Note(models.Model):
+    @property
+    def recurring(self):
+        return self.recurrence != self.Recurrence.NONE
+
+class NoteManager(models.Manager):
+    def summary(self):
+        return self.get_queryset().only('id', 'title', 'is_pinned', 'color', 'updated_at', 'user_id')
+
+class Note(OwnedByRequestUserMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
     content = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+    updated_at = models.DateTimeField(db_default=Now(), editable=False)
     is_pinned = models.BooleanField(default=False)
     color = models.CharField(max_length=7, default='#FFFFFF', help_text="Hex color code")
 
+    objects = NoteManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-is_pinned', '-updated_at']),
+        ]
+
     def __str__(self):
         return self.title
 
-class PomodoroSession(models.Model):
+class PomodoroSessionManager(BulkManager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('user', 'task')
+
+class PomodoroSession(OwnedByRequestUserMixin, models.Model):
+    BULK_BATCH_SIZE = 500
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    start_time = models.DateTimeField(auto_now_add=True)
+    start_time = models.DateTimeField(db_default=Now(), editable=False)
     end_time = models.DateTimeField(null=True, blank=True)
     duration = models.IntegerField(help_text="Duration in minutes", default=25)
     is_completed = models.BooleanField(default=False)
     task = models.ForeignKey(Task, on_delete=models.SET_NULL, null=True, blank=True)
 
+    objects = PomodoroSessionManager()
+    raw = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-start_time']),
+            models.Index(fields=['user'], condition=models.Q(is_completed=False), name='pomo_active'),
+        ]
+
     def __str__(self):
-        return f"Pomodoro Session - {self.start_time.strftime('%Y-%m-%d %H:%M')}"
+        dt = self.start_time
+        return f"Pomodoro Session - {dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
 
-class Reward(models.Model):
+class Reward(OwnedByRequestUserMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     points_required = models.IntegerField(default=0)
     is_claimed = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
 
     def __str__(self):
         return self.name
 
+QUOTE_CACHE_TTL = 60
+
 class DailyQuote(models.Model):
     quote = models.TextField()
     author = models.CharField(max_length=200, blank=True)
     date = models.DateField(unique=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        # daily_quote_today copies quote and author into each btree entry, and
+        # PostgreSQL caps entries at 2704 bytes: saving an active quote whose
+        # quote + author exceed that (after compression) fails on INSERT.
+        indexes = [
+            models.Index(
+                fields=['date'],
+                include=['quote', 'author'],
+                name='daily_quote_today',
+                condition=models.Q(is_active=True),
+            ),
+        ]
+
     def __str__(self):
         return f"Quote for {self.date}"
 
+    @classmethod
+    def for_today(cls):
+        # The time bucket expires entries after QUOTE_CACHE_TTL seconds, so
+        # workers that didn't see the save signal still pick up edits.
+        return _cached_quote(timezone.localdate().toordinal(), int(time.monotonic() // QUOTE_CACHE_TTL))
+
+@lru_cache(maxsize=2)
+def _cached_quote(ordinal, bucket):
+    # Sliced rather than .first(), which would add ORDER BY id and rule out
+    # an index-only scan on daily_quote_today. date is unique anyway.
+    rows = DailyQuote.objects.filter(date=date.fromordinal(ordinal), is_active=True).values('quote', 'author')[:1]
+    return rows[0] if rows else None
+
 class BreathingExercise(models.Model):
-    DIFFICULTY_CHOICES = [
-        ('E', 'Easy'),
-        ('M', 'Medium'),
-        ('H', 'Hard'),
-    ]
+    class Difficulty(models.TextChoices):
+        EASY = 'E', 'Easy'
+        MEDIUM = 'M', 'Medium'
+        HARD = 'H', 'Hard'
 
     name = models.CharField(max_length=200)
     description = models.TextField()
     duration = models.IntegerField(help_text="Duration in minutes")
-    steps = models.TextField(help_text="Step by step instructions")
-    difficulty = models.CharField(max_length=1, choices=DIFFICULTY_CHOICES, default='E')
+    steps = ArrayField(models.CharField(max_length=200), size=32, default=list, help_text="Step by step instructions")
+    difficulty = models.CharField(max_length=1, choices=Difficulty.choices, default=Difficulty.EASY)
     image_url = models.URLField(blank=True, help_text="URL to exercise image or video")
     
 
     def __str__(self):
         return self.name
 
-class MoodEntry(models.Model):
-    MOOD_CHOICES = [
-        ('1', '😊 Very Happy'),
-        ('2', '🙂 Happy'),
-        ('3', '😐 Neutral'),
-        ('4', '😕 Sad'),
-        ('5', '😢 Very Sad'),
-    ]
+class MoodEntryManager(BulkManager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
+class MoodEntry(OwnedByRequestUserMixin, models.Model):
+    BULK_BATCH_SIZE = 500
+
+    class Mood(models.TextChoices):
+        VERY_HAPPY = '1', '😊 Very Happy'
+        HAPPY = '2', '🙂 Happy'
+        NEUTRAL = '3', '😐 Neutral'
+        SAD = '4', '😕 Sad'
+        VERY_SAD = '5', '😢 Very Sad'
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     date = models.DateField(default=timezone.now)
-    mood = models.CharField(max_length=1, choices=MOOD_CHOICES)
+    mood = models.CharField(max_length=1, choices=Mood.choices)
     notes = models.TextField(blank=True, help_text="What influenced your mood today?")
     energy_level = models.IntegerField(
         help_text="Energy level from 1-10",
         validators=[MinValueValidator(1), MaxValueValidator(10)]
     )
-    sleep_hours = models.DecimalField(
-        max_digits=4,
-        decimal_places=1,
-        help_text="Hours of sleep last night",
+    sleep_hours_tenths = models.PositiveSmallIntegerField(
+        help_text="Tenths of an hour of sleep last night (75 = 7.5h)",
+        validators=[MaxValueValidator(240)],
         null=True,
         blank=True
     )
@@ -166,9 +360,43 @@ class MoodEntry(models.Model):
         help_text="Activities that might have affected your mood"
     )
 
+    objects = MoodEntryManager()
+    raw = models.Manager()
+
     class Meta:
-        unique_together = ['user', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='uniq_moodentry_user_date'),
+        ]
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['user', '-date']),
+        ]
 
     def __str__(self):
-        return f"{self.user.username}'s mood on {self.date}: {self.get_mood_display()}"
+        return f"{self.user.username}'s mood on {self.date}: {_MOOD_MAP.get(self.mood, self.mood)}"
+
+    @classmethod
+    def stats_for(cls, user, start, end):
+        happy = [cls.Mood.VERY_HAPPY, cls.Mood.HAPPY]
+        sad = [cls.Mood.SAD, cls.Mood.VERY_SAD]
+        return cls.objects.filter(user=user, date__range=(start, end)).aggregate(
+            avg_energy=Avg('energy_level'),
+            avg_sleep=Avg(Cast('sleep_hours_tenths', FloatField())) / 10,
+            happy_days=Count('id', filter=Q(mood__in=happy)),
+            sad_days=Count('id', filter=Q(mood__in=sad)),
+        )
+
+    @property
+    def sleep_hours(self):
+        return None if self.sleep_hours_tenths is None else self.sleep_hours_tenths / 10
+
+    @sleep_hours.setter
+    def sleep_hours(self, value):
+        if value is None:
+            self.sleep_hours_tenths = None
+        else:
+            # Half-up, matching the SQL ROUND() used by migration 0006.
+            tenths = Decimal(str(value)) * 10
+            self.sleep_hours_tenths = int(tenths.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+_MOOD_MAP = dict(MoodEntry.Mood.choices)
@@ -0,0 +1,59 @@
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import DailyQuote, Task, _cached_quote
+
+
+@receiver([post_save, post_delete], sender=DailyQuote)
+def clear_daily_quote_cache(sender, **kwargs):
+    _cached_quote.cache_clear()
+
+
+def _clear_has_subtasks_if_childless(parent_id):
+    Task.raw.filter(pk=parent_id, has_subtasks=True).exclude(
+        Exists(Task.raw.filter(parent_task=OuterRef('pk')))
+    ).update(has_subtasks=False)
+
+
+@receiver(pre_save, sender=Task)
+def remember_previous_parent(sender, instance, **kwargs):
+    # Task.from_db() snapshots parent_task_id; fall back to a lookup when the
+    # field was deferred on load.
+    if instance._state.adding or hasattr(instance, '_loaded_parent_task_id'):
+        return
+    instance._loaded_parent_task_id = (
+        Task.raw.filter(pk=instance.pk).values_list('parent_task_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Task)
+def update_parent_has_subtasks(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_loaded_parent_task_id', None)
+    current = instance.parent_task_id
+    instance._loaded_parent_task_id = current
+    if previous == current:
+        return
+    if current:
+        Task.raw.filter(pk=current, has_subtasks=False).update(has_subtasks=True)
+    if previous:
+        _clear_has_subtasks_if_childless(previous)
+
+
+@receiver(pre_delete, sender=Task)
+def remember_deleted_parent(sender, instance, **kwargs):
+    # Resolved while the row still exists: reading a deferred parent_task_id
+    # in post_delete would try to reload it and raise DoesNotExist.
+    if 'parent_task_id' in instance.__dict__:
+        instance._deleted_parent_task_id = instance.parent_task_id
+    else:
+        instance._deleted_parent_task_id = (
+            Task.raw.filter(pk=instance.pk).values_list('parent_task_id', flat=True).first()
+        )
+
+
+@receiver(post_delete, sender=Task)
+def clear_parent_has_subtasks(sender, instance, **kwargs):
+    parent_id = getattr(instance, '_deleted_parent_task_id', None)
+    if parent_id:
+        _clear_has_subtasks_if_childless(parent_id)
@@ -1,3 +1,354 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import (
+    QUOTE_CACHE_TTL,
+    Category,
+    DailyQuote,
+    MoodEntry,
+    Note,
+    OwnedByRequestUserMixin,
+    PomodoroSession,
+    Reward,
+    Tag,
+    Task,
+    _cached_quote,
+)
+
+
+class MigrationTestCase(TransactionTestCase):
+    migrate_from = None
+
+    def setUp(self):
+        self.addCleanup(self.migrate_to_latest)
+        self.apps = self.migrate(self.migrate_from)
+
+    def migrate(self, name):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('core', name)])
+        return executor.loader.project_state(('core', name)).apps
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+class DailyQuoteCacheTests(TestCase):
+    def setUp(self):
+        _cached_quote.cache_clear()
+        self.addCleanup(_cached_quote.cache_clear)
+
+    def test_for_today_is_cached(self):
+        DailyQuote.objects.create(date=timezone.localdate(), quote="Breathe.", author="Anon")
+        DailyQuote.for_today()
+        with self.assertNumQueries(0):
+            self.assertEqual(DailyQuote.for_today(), {'quote': "Breathe.", 'author': "Anon"})
+
+    def test_cache_expires_after_ttl(self):
+        quote = DailyQuote.objects.create(date=timezone.localdate(), quote="Breathe.")
+        with mock.patch('core.models.time.monotonic', return_value=0):
+            DailyQuote.for_today()
+        # Simulate a write from another worker: no signal reaches this process.
+        DailyQuote.objects.filter(pk=quote.pk).update(quote="Rest.")
+        with mock.patch('core.models.time.monotonic', return_value=QUOTE_CACHE_TTL - 1):
+            self.assertEqual(DailyQuote.for_today()['quote'], "Breathe.")
+        with mock.patch('core.models.time.monotonic', return_value=QUOTE_CACHE_TTL):
+            self.assertEqual(DailyQuote.for_today()['quote'], "Rest.")
+
+    def test_for_today_can_use_covering_index(self):
+        DailyQuote.objects.create(date=timezone.localdate(), quote="Breathe.")
+        with CaptureQueriesContext(connection) as ctx:
+            DailyQuote.for_today()
+        sql = ctx.captured_queries[0]['sql']
+        self.assertNotIn('ORDER BY', sql)
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('Index Only Scan using daily_quote_today', plan)
+
+    def test_save_clears_cache(self):
+        self.assertIsNone(DailyQuote.for_today())
+        DailyQuote.objects.create(date=timezone.localdate(), quote="Breathe.")
+        self.assertEqual(DailyQuote.for_today()['quote'], "Breathe.")
+
+
+class TaskHasSubtasksTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('zen')
+        self.parent = Task.objects.create(user=self.user, title="Parent")
+
+    def assertHasSubtasks(self, task, expected):
+        task.refresh_from_db(fields=['has_subtasks'])
+        self.assertIs(task.has_subtasks, expected)
+
+    def test_insert_marks_parent(self):
+        Task.objects.create(user=self.user, title="Child", parent_task=self.parent)
+        self.assertHasSubtasks(self.parent, True)
+
+    def test_resaving_child_issues_no_parent_update(self):
+        child = Task.objects.create(user=self.user, title="Child", parent_task=self.parent)
+        child = Task.raw.get(pk=child.pk)
+        child.title = "Renamed"
+        with self.assertNumQueries(1):
+            child.save()
+
+    def test_reparent_moves_flag(self):
+        other = Task.objects.create(user=self.user, title="Other")
+        child = Task.objects.create(user=self.user, title="Child", parent_task=self.parent)
+        child = Task.raw.get(pk=child.pk)
+        child.parent_task = other
+        child.save()
+        self.assertHasSubtasks(self.parent, False)
+        self.assertHasSubtasks(other, True)
+
+    def test_reparent_deferred_instance(self):
+        other = Task.objects.create(user=self.user, title="Other")
+        child = Task.objects.create(user=self.user, title="Child", parent_task=self.parent)
+        child = Task.raw.only('id').get(pk=child.pk)
+        child.parent_task = other
+        child.save()
+        self.assertHasSubtasks(self.parent, False)
+        self.assertHasSubtasks(other, True)
+
+    def test_deleting_last_child_clears_flag(self):
+        first = Task.objects.create(user=self.user, title="First", parent_task=self.parent)
+        second = Task.objects.create(user=self.user, title="Second", parent_task=self.parent)
+        first.delete()
+        self.assertHasSubtasks(self.parent, True)
+        second.delete()
+        self.assertHasSubtasks(self.parent, False)
+
+    def test_deleting_deferred_instance_clears_flag(self):
+        for queryset in (Task.objects.summary(), Task.raw.only('id')):
+            with self.subTest(query=str(queryset.query)):
+                child = Task.objects.create(user=self.user, title="Child", parent_task=self.parent)
+                self.assertHasSubtasks(self.parent, True)
+                queryset.get(pk=child.pk).delete()
+                self.assertHasSubtasks(self.parent, False)
+
+    def test_cascade_delete_clears_flag(self):
+        child = Task.objects.create(user=self.user, title="Child", parent_task=self.parent)
+        Task.objects.create(user=self.user, title="Grandchild", parent_task=child)
+        child.delete()
+        self.assertHasSubtasks(self.parent, False)
+        self.assertFalse(Task.raw.filter(title="Grandchild").exists())
+
+    def test_bulk_create_batched_marks_parents(self):
+        Task.objects.bulk_create_batched([
+            Task(user=self.user, title=f"Child {i}", parent_task=self.parent) for i in range(3)
+        ])
+        self.assertHasSubtasks(self.parent, True)
+
+
+class TaskClaimNextTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('zen')
+
+    def make(self, title, priority, due_day=None, **kwargs):
+        due_date = None if due_day is None else timezone.now() + timedelta(days=due_day)
+        return Task.objects.create(user=self.user, title=title, priority=priority, due_date=due_date, **kwargs)
+
+    def test_claims_highest_priority_earliest_due_pending_task(self):
+        self.make("Low soon", Task.Priority.LOW, 1)
+        self.make("High later", Task.Priority.HIGH, 5)
+        target = self.make("High sooner", Task.Priority.HIGH, 2)
+        self.make("High undated", Task.Priority.HIGH)
+        self.make("High started", Task.Priority.HIGH, 0, status=Task.Status.IN_PROGRESS)
+
+        self.assertEqual(Task.objects.claim_next(self.user), (target.pk, "High sooner"))
+        target.refresh_from_db()
+        self.assertEqual(target.status, Task.Status.IN_PROGRESS)
+
+    def test_returns_none_when_nothing_pending(self):
+        other = User.objects.create_user('other')
+        Task.objects.create(user=other, title="Not mine")
+        self.make("Done", Task.Priority.HIGH, status=Task.Status.COMPLETED)
+        self.assertIsNone(Task.objects.claim_next(self.user))
+
+
+class OwnedByRequestUserMixinTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('zen')
+        category = Category.objects.create(user=self.user, name="Work")
+        task = Task.objects.create(user=self.user, title="Focus", category=category)
+        Tag.objects.create(user=self.user, name="calm")
+        Note.objects.create(user=self.user, title="Idea", content="...")
+        PomodoroSession.objects.create(user=self.user, task=task)
+        Reward.objects.create(user=self.user, name="Tea")
+        MoodEntry.objects.create(user=self.user, mood=MoodEntry.Mood.HAPPY, energy_level=5)
+
+    def test_for_user_skips_auth_user_join(self):
+        models = [Category, Tag, Task, Note, PomodoroSession, Reward, MoodEntry]
+        self.assertTrue(all(issubclass(model, OwnedByRequestUserMixin) for model in models))
+        for model in models:
+            with self.subTest(model=model.__name__):
+                with CaptureQueriesContext(connection) as ctx:
+                    objs = list(model.for_user(self.user))
+                    self.assertEqual(len(objs), 1)
+                    self.assertIs(objs[0].user, self.user)
+                self.assertEqual(len(ctx.captured_queries), 1)
+                self.assertNotIn('auth_user', ctx.captured_queries[0]['sql'])
+
+    def test_for_user_keeps_other_joins(self):
+        with self.assertNumQueries(1):
+            task = next(Task.for_user(self.user))
+            self.assertEqual(task.category.name, "Work")
+
+
+class TaskCanonicalCodesMigrationTests(MigrationTestCase):
+    migrate_from = '0002_breathingexercise_dailyquote_and_more'
+
+    def test_remaps_populated_rows_both_ways(self):
+        User = self.apps.get_model('auth', 'User')
+        Task = self.apps.get_model('core', 'Task')
+        user = User.objects.create(username='zen')
+        pk = Task.objects.create(user=user, title="Legacy", status='cancelled', priority='high').pk
+
+        Task = self.migrate('0004_task_canonical_fields').get_model('core', 'Task')
+        self.assertEqual(Task.objects.values_list('status', 'priority').get(pk=pk), ('X', 'H'))
+
+        Task = self.migrate(self.migrate_from).get_model('core', 'Task')
+        self.assertEqual(Task.objects.values_list('status', 'priority').get(pk=pk), ('cancelled', 'high'))
+
+    def test_full_chain_applies_and_reverts_with_tasks(self):
+        User = self.apps.get_model('auth', 'User')
+        Task = self.apps.get_model('core', 'Task')
+        user = User.objects.create(username='zen')
+        pk = Task.objects.create(user=user, title="Legacy", status='in_progress', priority='low').pk
+
+        self.migrate_to_latest()
+        self.assertEqual(Task.objects.values_list('status', 'priority').get(pk=pk), ('IP', 'L'))
+
+        Task = self.migrate(self.migrate_from).get_model('core', 'Task')
+        self.assertEqual(Task.objects.values_list('status', 'priority').get(pk=pk), ('in_progress', 'low'))
+
+
+class PaletteColorMigrationTests(MigrationTestCase):
+    migrate_from = '0004_task_canonical_fields'
+
+    def test_converts_hex_colors_to_palette_indexes_and_back(self):
+        User = self.apps.get_model('auth', 'User')
+        user = User.objects.create(username='zen')
+        category_pk = self.apps.get_model('core', 'Category').objects.create(
+            user=user, name="Urgent", color='#F44336'
+        ).pk
+        tag_pk = self.apps.get_model('core', 'Tag').objects.create(user=user, name="calm", color='#ffdab9').pk
+
+        apps = self.migrate('0005_palette_color_index')
+        self.assertEqual(apps.get_model('core', 'Category').objects.get(pk=category_pk).color, 5)
+        self.assertEqual(apps.get_model('core', 'Tag').objects.get(pk=tag_pk).color, 3)
+
+        apps = self.migrate(self.migrate_from)
+        self.assertEqual(apps.get_model('core', 'Category').objects.get(pk=category_pk).color, '#F44336')
+        self.assertEqual(apps.get_model('core', 'Tag').objects.get(pk=tag_pk).color, '#FFDAB9')
+
+
+class MoodEntrySleepHoursTests(TestCase):
+    def test_property_reads_tenths(self):
+        self.assertEqual(MoodEntry(sleep_hours_tenths=75).sleep_hours, 7.5)
+        self.assertIsNone(MoodEntry().sleep_hours)
+
+    def test_setter_stores_tenths(self):
+        entry = MoodEntry(sleep_hours=Decimal('7.5'))
+        self.assertEqual(entry.sleep_hours_tenths, 75)
+        entry.sleep_hours = 8
+        self.assertEqual(entry.sleep_hours_tenths, 80)
+        entry.sleep_hours = None
+        self.assertIsNone(entry.sleep_hours_tenths)
+
+    def test_setter_rounds_half_up(self):
+        entry = MoodEntry()
+        for value, expected in [(7.45, 75), (Decimal('7.25'), 73), (7.44, 74)]:
+            with self.subTest(value=value):
+                entry.sleep_hours = value
+                self.assertEqual(entry.sleep_hours_tenths, expected)
+
+
+class SleepHoursTenthsMigrationTests(MigrationTestCase):
+    migrate_from = '0005_palette_color_index'
+
+    def test_converts_hours_to_tenths_and_back(self):
+        User = self.apps.get_model('auth', 'User')
+        MoodEntry = self.apps.get_model('core', 'MoodEntry')
+        user = User.objects.create(username='zen')
+        slept = MoodEntry.objects.create(user=user, date=date(2025, 1, 1), mood='3', energy_level=5, sleep_hours=Decimal('7.5'))
+        unknown = MoodEntry.objects.create(user=user, date=date(2025, 1, 2), mood='3', energy_level=5)
+
+        MoodEntry = self.migrate('0006_moodentry_sleep_hours_tenths').get_model('core', 'MoodEntry')
+        self.assertEqual(MoodEntry.objects.get(pk=slept.pk).sleep_hours_tenths, 75)
+        self.assertIsNone(MoodEntry.objects.get(pk=unknown.pk).sleep_hours_tenths)
+
+        MoodEntry = self.migrate(self.migrate_from).get_model('core', 'MoodEntry')
+        self.assertEqual(MoodEntry.objects.get(pk=slept.pk).sleep_hours, Decimal('7.5'))
+        self.assertIsNone(MoodEntry.objects.get(pk=unknown.pk).sleep_hours)
+
+
+class MoodEntryStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('zen')
+
+    def add(self, day, mood, energy, sleep_hours=None):
+        MoodEntry.objects.create(
+            user=self.user, date=date(2025, 1, day), mood=mood, energy_level=energy, sleep_hours=sleep_hours
+        )
+
+    def test_aggregates_range_in_one_query(self):
+        self.add(1, MoodEntry.Mood.VERY_HAPPY, 8, 8)
+        self.add(2, MoodEntry.Mood.HAPPY, 6, 7)
+        self.add(3, MoodEntry.Mood.SAD, 4)
+        self.add(4, MoodEntry.Mood.NEUTRAL, 5, 6)
+        self.add(20, MoodEntry.Mood.VERY_SAD, 1, 3)
+        other = User.objects.create_user('other')
+        MoodEntry.objects.create(user=other, date=date(2025, 1, 2), mood=MoodEntry.Mood.VERY_SAD, energy_level=1)
+
+        with self.assertNumQueries(1):
+            stats = MoodEntry.stats_for(self.user, date(2025, 1, 1), date(2025, 1, 10))
+        self.assertEqual(stats['avg_energy'], 5.75)
+        # The NULL sleep entry is left out of the average rather than counted as zero.
+        self.assertAlmostEqual(stats['avg_sleep'], 7.0)
+        self.assertEqual(stats['happy_days'], 2)
+        self.assertEqual(stats['sad_days'], 1)
+
+    def test_empty_range(self):
+        self.add(1, MoodEntry.Mood.HAPPY, 6, 7)
+        stats = MoodEntry.stats_for(self.user, date(2025, 2, 1), date(2025, 2, 28))
+        self.assertEqual(stats, {'avg_energy': None, 'avg_sleep': None, 'happy_days': 0, 'sad_days': 0})
+
+    def test_all_sleep_null(self):
+        self.add(1, MoodEntry.Mood.HAPPY, 6)
+        stats = MoodEntry.stats_for(self.user, date(2025, 1, 1), date(2025, 1, 31))
+        self.assertIsNone(stats['avg_sleep'])
+        self.assertEqual(stats['avg_energy'], 6)
+
+
+class BreathingStepsMigrationTests(MigrationTestCase):
+    migrate_from = '0012_task_due_open_index'
+
+    def create(self, steps):
+        BreathingExercise = self.apps.get_model('core', 'BreathingExercise')
+        return BreathingExercise.objects.create(name="Box", description="", duration=4, steps=steps)
+
+    def test_splits_steps_on_newlines(self):
+        pk = self.create("Inhale\n\n  Hold  \nExhale").pk
+        BreathingExercise = self.migrate('0013_breathingexercise_steps_array').get_model('core', 'BreathingExercise')
+        self.assertEqual(BreathingExercise.objects.get(pk=pk).steps, ["Inhale", "Hold", "Exhale"])
+
+    def test_refuses_over_long_data(self):
+        for steps in ("Inhale\n" + "x" * 201, "\n".join(["Breathe"] * 33)):
+            with self.subTest(steps=steps[:20]):
+                exercise = self.create(steps)
+                with self.assertRaisesMessage(RuntimeError, f"rows [{exercise.pk}]"):
+                    self.migrate('0013_breathingexercise_steps_array')
+                BreathingExercise = self.apps.get_model('core', 'BreathingExercise')
+                self.assertEqual(BreathingExercise.objects.get(pk=exercise.pk).steps, steps)
+                exercise.delete()